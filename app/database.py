@@ -2,7 +2,7 @@
 Database configuration and session management.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -10,12 +10,20 @@ from app.config import settings
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    # Recycle connections on a fixed lifetime instead of pinging on every checkout
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,  # Compiled SQL cache
     echo=False,  # Set to True to log SQL queries
 )
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps rows returned by INSERT ... RETURNING usable
+# after commit without re-selecting them
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 # Base class for models
 Base = declarative_base()
@@ -31,3 +39,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def warm_up_pool():
+    """
+    Open every pooled connection once at startup so the first requests
+    don't pay for TCP/TLS setup and authentication.
+    """
+    connections = []
+    try:
+        for _ in range(settings.DB_POOL_SIZE):
+            connections.append(engine.connect())
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
@@ -1,11 +1,23 @@
 """
 SQLAlchemy ORM models for User and APIKey.
+
+Primary keys are time-ordered UUIDv7 values so new rows append to the end of
+the primary key index instead of landing on random pages.
 """
 
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Uuid
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    Boolean,
+    ForeignKey,
+    Index,
+    Uuid,
+    text,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import uuid
+import uuid6
 from app.database import Base
 
 
@@ -14,7 +26,7 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid6.uuid7, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -38,9 +50,19 @@ class APIKey(Base):
     """API Key model for service-to-service authentication."""
 
     __tablename__ = "api_keys"
+    __table_args__ = (
+        # Partial index: validation only ever looks up non-revoked keys
+        Index(
+            "ix_api_keys_key_hash_active",
+            "key_hash",
+            unique=True,
+            postgresql_where=text("is_revoked = false"),
+            sqlite_where=text("is_revoked = 0"),
+        ),
+    )
 
-    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    key_hash = Column(String, unique=True, index=True, nullable=False)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid6.uuid7, index=True)
+    key_hash = Column(String, nullable=False)
     name = Column(String, nullable=False)
     user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -60,7 +82,7 @@ class TokenBlacklist(Base):
 
     __tablename__ = "token_blacklist"
 
-    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid6.uuid7, index=True)
     token_jti = Column(String, unique=True, index=True, nullable=False)
     # Store expiration so we can eventually clean up old blacklisted tokens
     expires_at = Column(DateTime, nullable=False)
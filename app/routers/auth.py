@@ -3,6 +3,7 @@ Authentication routes for user signup and login.
 """
 
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.auth import (
@@ -55,8 +56,13 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
     **Errors:**
     - `400 Bad Request`: Email or username already exists
     """
-    user = create_user(db, user_data)
-    return user
+    user = await create_user(db, user_data)
+    # Return the response directly so FastAPI skips re-validating it
+    # against response_model and the jsonable_encoder pass
+    return ORJSONResponse(
+        UserResponse.model_validate(user).model_dump(),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.post("/login", response_model=Token, dependencies=[Depends(login_limiter)])
@@ -82,12 +88,10 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     Authorization: Bearer <access_token>
     ```
     """
-    user = authenticate_user(db, user_data.username, user_data.password)
+    user = await authenticate_user(db, user_data.username, user_data.password)
     access_token = create_user_token(user)
 
-    access_token = create_user_token(user)
-
-    return {"access_token": access_token, "token_type": "bearer"}
+    return ORJSONResponse({"access_token": access_token, "token_type": "bearer"})
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
@@ -125,5 +129,5 @@ async def reset_password_endpoint(
     """
     Reset password using a valid token.
     """
-    reset_password(db, request.token, request.new_password)
+    await reset_password(db, request.token, request.new_password)
     return {"message": "Password successfully reset"}
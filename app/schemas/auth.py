@@ -2,18 +2,100 @@
 Pydantic schemas for request/response validation.
 """
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import AfterValidator, BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 import re
+import string
+
+# Structural email check: local part of dot-separated RFC 5322 atext segments,
+# at least two domain labels each starting and ending with a letter or digit,
+# and an alphabetic top-level domain. Unlike email-validator it does not accept
+# quoted local parts or check label lengths and special-use domains.
+_ATEXT = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+"
+_DOMAIN_LABEL = r"[^\W_](?:(?:[^\W_]|-)*[^\W_])?"
+_EMAIL_RE = re.compile(rf"{_ATEXT}(?:\.{_ATEXT})*@(?:{_DOMAIN_LABEL}\.)+[^\W\d_]{{2,}}")
+
+
+def _validate_email(value: str) -> str:
+    """
+    Cheap structural email check, avoiding the email-validator library.
+    The domain is lowercased, matching EmailStr normalization.
+    """
+    if len(value) > 254 or "@" not in value or not _EMAIL_RE.fullmatch(value):
+        raise ValueError("value is not a valid email address")
+    local, domain = value.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
+
+
+EmailAddress = Annotated[str, AfterValidator(_validate_email)]
+
+# Characters accepted as the "special character" in a password
+_SPECIALS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+# Byte -> character class lookup table for password strength checks
+_UPPER, _LOWER, _DIGIT, _SPECIAL = 1, 2, 3, 4
+
+
+def _build_class_table() -> bytes:
+    table = bytearray(256)
+    for classes, code in (
+        (string.ascii_uppercase, _UPPER),
+        (string.ascii_lowercase, _LOWER),
+        (string.digits, _DIGIT),
+        (_SPECIALS, _SPECIAL),
+    ):
+        for ch in classes:
+            table[ord(ch)] = code
+    return bytes(table)
+
+
+_CLASS_TABLE = _build_class_table()
+
+
+def _check_password_strength(value: str) -> str:
+    """
+    Ensure a password contains an uppercase letter, a lowercase letter,
+    a number and a special character.
+
+    ASCII characters are mapped to character classes with bytes.translate
+    and each class is then located with a C-level byte search; any
+    non-ASCII characters fall back to the str predicates.
+    """
+    classes = value.encode("ascii", "ignore").translate(_CLASS_TABLE)
+    if not value.isascii():
+        # Non-ASCII letters and digits still count, as with str.isupper etc.
+        classes += bytes(
+            _UPPER if ch.isupper() else _LOWER if ch.islower() else _DIGIT
+            for ch in value
+            if not ch.isascii() and (ch.isupper() or ch.islower() or ch.isdigit())
+        )
+    if (
+        _UPPER in classes
+        and _LOWER in classes
+        and _DIGIT in classes
+        and _SPECIAL in classes
+    ):
+        return value
+
+    raise ValueError(
+        "Password must contain at least one uppercase letter, lowercase letter, "
+        "number, and special character"
+    )
+
+
+# Shared password type so both models reuse one validator definition
+StrongPassword = Annotated[
+    str, Field(min_length=8), AfterValidator(_check_password_strength)
+]
 
 
 # User Schemas
 class UserSignup(BaseModel):
     """Schema for user registration."""
 
-    email: EmailStr = Field(
+    email: EmailAddress = Field(
         ...,
         description="User's email address",
         examples=["user@example.com"],
@@ -27,26 +109,13 @@ class UserSignup(BaseModel):
         examples=["johndoe123"],
         title="Username",
     )
-    password: str = Field(
+    password: StrongPassword = Field(
         ...,
-        min_length=8,
         description="Password must be at least 8 characters long and contain uppercase, lowercase, number, and special character",
         examples=["StrongPass1!"],
         title="Password",
     )
 
-    @field_validator("password")
-    def validate_password(cls, value):
-        if not re.search(r"[A-Z]", value):
-            raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", value):
-            raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"\d", value):
-            raise ValueError("Password must contain at least one number")
-        if not re.search(r"[!@#$%^&*()_+\-=\[\]{}|;:,.<>?]", value):
-            raise ValueError("Password must contain at least one special character")
-        return value
-
 
 class UserLogin(BaseModel):
     """Schema for user login."""
@@ -100,7 +169,7 @@ class Logout(BaseModel):
 class ForgotPasswordRequest(BaseModel):
     """Schema for requesting a password reset."""
 
-    email: EmailStr = Field(
+    email: EmailAddress = Field(
         ...,
         description="Email address associated with the account",
         examples=["user@example.com"],
@@ -117,26 +186,13 @@ class ResetPasswordRequest(BaseModel):
         examples=["9f85c15e..."],
         title="Reset Token",
     )
-    new_password: str = Field(
+    new_password: StrongPassword = Field(
         ...,
-        min_length=8,
         description="New password (must follow complexity rules)",
         examples=["NewStrongPass2@"],
         title="New Password",
     )
 
-    @field_validator("new_password")
-    def validate_password(cls, value):
-        if not re.search(r"[A-Z]", value):
-            raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", value):
-            raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"\d", value):
-            raise ValueError("Password must contain at least one number")
-        if not re.search(r"[!@#$%^&*()_+\-=\[\]{}|;:,.<>?]", value):
-            raise ValueError("Password must contain at least one special character")
-        return value
-
 
 # API Key Schemas
 class APIKeyCreate(BaseModel):
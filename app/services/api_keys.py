@@ -3,17 +3,81 @@ API Key service layer.
 Business logic for API key generation, validation, and management.
 """
 
+from sqlalchemy import Row, bindparam, delete, insert, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from datetime import datetime, timedelta
-from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from app.models.auth import APIKey
-from app.utils.security import generate_api_key, get_key_hash
+from app.utils.security import (
+    generate_api_key,
+    get_key_hash,
+    is_valid_api_key_format,
+)
 from app.config import settings
+from app.database import SessionLocal
+import asyncio
+import logging
+import time
 
-# Simple in-memory cache: {key_hash: (api_key_dict, expiration_timestamp)}
-API_KEY_CACHE = {}
+logger = logging.getLogger(__name__)
+
+# Bounded LRU cache: {key_hash: (api_key_dict, monotonic_expiry)}
+API_KEY_CACHE: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+API_KEY_CACHE_MAX_SIZE = 10_000
+API_KEY_CACHE_TTL_SECONDS = 300.0
+
+# Reverse index so revocation can invalidate by ID: {api_key_id: key_hash}
+API_KEY_CACHE_IDS: Dict[UUID, str] = {}
+
+
+# Pending last_used_at writes, flushed in batches: {api_key_id: posix_timestamp}
+_LAST_USED_QUEUE: Dict[UUID, float] = {}
+_LAST_USED_LOCK = asyncio.Lock()
+LAST_USED_FLUSH_INTERVAL_SECONDS = 5.0
+
+
+def _cache_get(key_hash: str) -> Optional[dict]:
+    """Return cached API key info if present and not expired."""
+    entry = API_KEY_CACHE.get(key_hash)
+    if entry is None:
+        return None
+
+    cached_data, valid_until = entry
+    if valid_until <= time.monotonic():
+        _cache_discard(key_hash)
+        return None
+
+    API_KEY_CACHE.move_to_end(key_hash)
+    return cached_data
+
+
+def _cache_set(key_hash: str, data: dict, ttl: float = API_KEY_CACHE_TTL_SECONDS):
+    """Cache API key info, evicting the least recently used entry when full."""
+    _cache_discard(key_hash)
+    API_KEY_CACHE[key_hash] = (data, time.monotonic() + ttl)
+    API_KEY_CACHE_IDS[data["api_key_id"]] = key_hash
+
+    if len(API_KEY_CACHE) > API_KEY_CACHE_MAX_SIZE:
+        _, (evicted, _) = API_KEY_CACHE.popitem(last=False)
+        API_KEY_CACHE_IDS.pop(evicted["api_key_id"], None)
+
+
+def _cache_discard(key_hash: str):
+    """Remove a single entry from the cache by key hash."""
+    entry = API_KEY_CACHE.pop(key_hash, None)
+    if entry is not None:
+        API_KEY_CACHE_IDS.pop(entry[0]["api_key_id"], None)
+
+
+def _cache_invalidate(key_id: UUID):
+    """Remove a cached API key by its ID."""
+    key_hash = API_KEY_CACHE_IDS.pop(key_id, None)
+    if key_hash is not None:
+        API_KEY_CACHE.pop(key_hash, None)
 
 
 def create_api_key(
@@ -51,14 +115,13 @@ def create_api_key(
     # Calculate expiration date
     expires_at = datetime.utcnow() + timedelta(days=expires_in_days)
 
-    # Create API key record
-    db_api_key = APIKey(
-        key_hash=key_hash, name=name, user_id=user_id, expires_at=expires_at
-    )
-
-    db.add(db_api_key)
+    # Create API key record; RETURNING avoids a refresh SELECT
+    db_api_key = db.execute(
+        insert(APIKey)
+        .values(key_hash=key_hash, name=name, user_id=user_id, expires_at=expires_at)
+        .returning(APIKey)
+    ).scalar_one()
     db.commit()
-    db.refresh(db_api_key)
 
     # Attach plain key to object for one-time display (not persisted)
     db_api_key.key = plain_key
@@ -68,7 +131,7 @@ def create_api_key(
 
 def validate_api_key(db: Session, key: str) -> Optional[dict]:
     """
-    Validate an API key and update its last_used_at timestamp.
+    Validate an API key and queue an update of its last_used_at timestamp.
 
     Args:
         db: Database session
@@ -80,19 +143,19 @@ def validate_api_key(db: Session, key: str) -> Optional[dict]:
     Raises:
         HTTPException: If API key is expired
     """
+    # Reject malformed keys before hashing or touching the database
+    if not is_valid_api_key_format(key):
+        return None
+
     key_hash = get_key_hash(key)
 
     # Check cache
-    if key_hash in API_KEY_CACHE:
-        cached_data, valid_until = API_KEY_CACHE[key_hash]
-        if datetime.utcnow() < valid_until:
-            # Update last_used_at in background?
-            # For strictness we skip DB write on cache hit for speed, or use a background task.
-            # Here we prioritized speed, so we skip DB write.
-            return cached_data
-        else:
-            del API_KEY_CACHE[key_hash]
+    cached_data = _cache_get(key_hash)
+    if cached_data is not None:
+        _LAST_USED_QUEUE[cached_data["api_key_id"]] = time.time()
+        return cached_data
 
+    # Predicate must stay `is_revoked = false` to match ix_api_keys_key_hash_active
     api_key = (
         db.query(APIKey)
         .filter(APIKey.key_hash == key_hash, APIKey.is_revoked == False)
@@ -102,15 +165,16 @@ def validate_api_key(db: Session, key: str) -> Optional[dict]:
     if not api_key:
         return None
 
-    # Check if expired
-    if api_key.expires_at < datetime.utcnow():
+    # Check if expired (expires_at is stored as naive UTC)
+    now_ts = time.time()
+    expires_ts = api_key.expires_at.replace(tzinfo=timezone.utc).timestamp()
+    if expires_ts < now_ts:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="API key has expired"
         )
 
-    # Update last used timestamp
-    api_key.last_used_at = datetime.utcnow()
-    db.commit()
+    # Queue last used timestamp; written in batches by flush_last_used
+    _LAST_USED_QUEUE[api_key.id] = now_ts
 
     result = {
         "api_key_id": api_key.id,
@@ -119,24 +183,99 @@ def validate_api_key(db: Session, key: str) -> Optional[dict]:
         "type": "service",
     }
 
-    # Cache for 5 minutes
-    API_KEY_CACHE[key_hash] = (result, datetime.utcnow() + timedelta(minutes=5))
+    # Cache for 5 minutes, or until the key expires if that is sooner
+    _cache_set(key_hash, result, min(API_KEY_CACHE_TTL_SECONDS, expires_ts - now_ts))
 
     return result
 
 
-def list_user_api_keys(db: Session, user_id: UUID) -> List[APIKey]:
+def _write_last_used(session_factory, pending: Dict[UUID, float]):
+    """Persist queued last_used_at timestamps in a single batch."""
+    # Core executemany rather than ORM bulk update: keys deleted since they
+    # were queued simply match no row instead of failing the whole batch.
+    table = APIKey.__table__
+    db = session_factory()
+    try:
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("key_id"))
+            .values(last_used_at=bindparam("used_at")),
+            [
+                {"key_id": key_id, "used_at": datetime.utcfromtimestamp(used_ts)}
+                for key_id, used_ts in pending.items()
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def flush_last_used(session_factory=SessionLocal):
+    """
+    Write all queued last_used_at updates to the database.
+
+    If the write fails the batch is put back on the queue, keeping any newer
+    timestamps recorded in the meantime, and the error is re-raised.
+
+    Args:
+        session_factory: Callable returning a new database session
+    """
+    global _LAST_USED_QUEUE
+
+    async with _LAST_USED_LOCK:
+        pending, _LAST_USED_QUEUE = _LAST_USED_QUEUE, {}
+        if not pending:
+            return
+        try:
+            await run_in_threadpool(_write_last_used, session_factory, pending)
+        except Exception:
+            for key_id, used_ts in pending.items():
+                if _LAST_USED_QUEUE.get(key_id, 0.0) < used_ts:
+                    _LAST_USED_QUEUE[key_id] = used_ts
+            raise
+
+
+async def flush_last_used_periodically(
+    interval: float = LAST_USED_FLUSH_INTERVAL_SECONDS,
+):
+    """
+    Background task flushing queued last_used_at updates every `interval` seconds.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush_last_used()
+        except Exception:
+            # Keep the task alive; the batch stays queued for the next attempt
+            logger.exception("Failed to flush API key last_used_at updates")
+
+
+def list_user_api_keys(db: Session, user_id: UUID) -> List[Row]:
     """
     Get all API keys for a user.
 
+    Only the columns exposed by APIKeyListResponse are loaded, so the rows
+    skip ORM hydration and never read key_hash.
+
     Args:
         db: Database session
         user_id: ID of the user
 
     Returns:
-        List of API key objects
+        List of API key rows
     """
-    return db.query(APIKey).filter(APIKey.user_id == user_id).all()
+    return (
+        db.query(
+            APIKey.id,
+            APIKey.name,
+            APIKey.created_at,
+            APIKey.expires_at,
+            APIKey.is_revoked,
+            APIKey.last_used_at,
+        )
+        .filter(APIKey.user_id == user_id)
+        .all()
+    )
 
 
 def revoke_api_key(db: Session, key_id: UUID, user_id: UUID) -> APIKey:
@@ -154,41 +293,23 @@ def revoke_api_key(db: Session, key_id: UUID, user_id: UUID) -> APIKey:
     Raises:
         HTTPException: If API key not found
     """
-    api_key = (
-        db.query(APIKey).filter(APIKey.id == key_id, APIKey.user_id == user_id).first()
-    )
+    # Ownership check and update in one statement
+    api_key = db.execute(
+        update(APIKey)
+        .where(APIKey.id == key_id, APIKey.user_id == user_id)
+        .values(is_revoked=True)
+        .returning(APIKey)
+    ).scalar_one_or_none()
 
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="API key not found"
         )
 
-    api_key.is_revoked = True
     db.commit()
-    db.refresh(api_key)
-
-    # Invalidate cache
-    # Since we don't have the original key string here, we can't easily remove it from cache
-    # if the cache key is the hash.
-    # However, since we query DB on cache miss, and revocation updates DB,
-    # we just need to ensure we don't rely on stale cache.
-    # But wait, if cached, we return cached data and ignore DB.
-    # So we MUST invalidate cache.
-    # Problem: 'revoke_api_key' input is 'key_id', not 'key'.
-    # We can't derive 'key_hash' from 'key_id'.
-    # Solution: We can't selectively invalidate efficiently without storing map id->hash.
-    # OR we accept 5 min delay in revocation (acceptable for "Speed").
-    # OR we clear entire cache check (heavy).
-    # OR we add key_hash to cache value so we can iterate.
-
-    # Let's iterate cache to remove by ID (O(N) but N is cache size).
-    keys_to_remove = []
-    for k, (v, _) in API_KEY_CACHE.items():
-        if v["api_key_id"] == key_id:
-            keys_to_remove.append(k)
-
-    for k in keys_to_remove:
-        del API_KEY_CACHE[k]
+
+    # Invalidate cache so the revoked key is rejected immediately
+    _cache_invalidate(key_id)
 
     return api_key
 
@@ -205,23 +326,18 @@ def delete_api_key(db: Session, key_id: UUID, user_id: UUID):
     Raises:
         HTTPException: If API key not found
     """
-    api_key = (
-        db.query(APIKey).filter(APIKey.id == key_id, APIKey.user_id == user_id).first()
+    # Ownership check and delete in one statement
+    result = db.execute(
+        delete(APIKey).where(APIKey.id == key_id, APIKey.user_id == user_id)
     )
 
-    if not api_key:
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="API key not found"
         )
 
-    # Invalidate cache before delete
-    keys_to_remove = []
-    for k, (v, _) in API_KEY_CACHE.items():
-        if v["api_key_id"] == key_id:
-            keys_to_remove.append(k)
-
-    for k in keys_to_remove:
-        del API_KEY_CACHE[k]
-
-    db.delete(api_key)
     db.commit()
+
+    # Invalidate cache and drop any pending last_used_at write
+    _cache_invalidate(key_id)
+    _LAST_USED_QUEUE.pop(key_id, None)
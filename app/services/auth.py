@@ -3,16 +3,20 @@ Authentication service layer.
 Business logic for user authentication and JWT token management.
 """
 
+from sqlalchemy import Row, insert, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from datetime import timedelta, datetime
+from typing import Union
 from app.models.auth import User, TokenBlacklist
 from app.schemas.auth import UserSignup, UserLogin
 from app.utils.security import get_password_hash, verify_password, create_access_token
 from app.config import settings
 
 
-def create_user(db: Session, user_data: UserSignup) -> User:
+async def create_user(db: Session, user_data: UserSignup) -> User:
     """
     Create a new user in the database.
 
@@ -26,51 +30,77 @@ def create_user(db: Session, user_data: UserSignup) -> User:
     Raises:
         HTTPException: If email or username already exists
     """
-    # Check if email already exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    # Check if email or username already exists in a single query. Up to two
+    # rows can match (one per field); the email conflict is reported first.
+    existing = (
+        db.query(User.email, User.username)
+        .filter(or_(User.email == user_data.email, User.username == user_data.username))
+        .limit(2)
+        .all()
+    )
+    if any(row.email == user_data.email for row in existing):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
         )
-
-    # Check if username already exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken"
         )
 
-    # Hash password and create user
-    hashed_password = get_password_hash(user_data.password)
-    db_user = User(
-        email=user_data.email,
-        username=user_data.username,
-        hashed_password=hashed_password,
+    # Hash password off the event loop and create user
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
+    # INSERT ... RETURNING hands back the new row without a refresh SELECT
+    stmt = (
+        insert(User)
+        .values(
+            email=user_data.email,
+            username=user_data.username,
+            hashed_password=hashed_password,
+        )
+        .returning(User)
     )
-
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        db_user = db.execute(stmt).scalar_one()
+        db.commit()
+    except IntegrityError:
+        # A concurrent signup claimed the email or username after our check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or username already registered",
+        )
 
     return db_user
 
 
-def authenticate_user(db: Session, username: str, password: str) -> User:
+async def authenticate_user(db: Session, username: str, password: str) -> Row:
     """
     Authenticate a user with username and password.
 
+    Only the columns needed for the check are selected, so no User instance
+    is hydrated for failed logins.
+
     Args:
         db: Database session
         username: User's username
         password: Plain text password
 
     Returns:
-        Authenticated user object
+        Row with the authenticated user's id, hashed_password and is_active
 
     Raises:
         HTTPException: If credentials are invalid
     """
-    user = db.query(User).filter(User.username == username).first()
+    user = db.execute(
+        select(User.id, User.hashed_password, User.is_active).where(
+            User.username == username
+        )
+    ).first()
 
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await run_in_threadpool(
+        verify_password, password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -85,12 +115,12 @@ def authenticate_user(db: Session, username: str, password: str) -> User:
     return user
 
 
-def create_user_token(user: User) -> str:
+def create_user_token(user: Union[User, Row]) -> str:
     """
     Create a JWT access token for a user.
 
     Args:
-        user: User object
+        user: User object or row with an `id` column
 
     Returns:
         JWT access token string
@@ -202,7 +232,7 @@ def create_password_reset_token(db: Session, email: str) -> str:
     return token
 
 
-def reset_password(db: Session, token: str, new_password: str):
+async def reset_password(db: Session, token: str, new_password: str):
     """
     Reset user password using a valid token.
 
@@ -231,7 +261,7 @@ def reset_password(db: Session, token: str, new_password: str):
         )
 
     # Update password
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await run_in_threadpool(get_password_hash, new_password)
 
     # Clear token
     user.reset_token_hash = None
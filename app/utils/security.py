@@ -3,13 +3,43 @@ Security utilities for password hashing, JWT tokens, and API key generation.
 """
 
 import bcrypt
+import orjson
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
+import base64
+import hashlib
+import hmac
+import os
 import secrets
+import time
 from app.config import settings
 
 
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as required by JWS."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# API keys are "sk_" followed by API_KEY_BYTES random bytes, base64url-encoded
+API_KEY_PREFIX = "sk_"
+API_KEY_BYTES = 32
+API_KEY_LENGTH = len(API_KEY_PREFIX) + len(_b64url(bytes(API_KEY_BYTES)))
+
+# Constant header of an HS256 token, built once and reused for every login
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
+@lru_cache(maxsize=1)
+def _jwt_hmac(secret_key: str) -> "hmac.HMAC":
+    """
+    Keyed HMAC-SHA256 template for signing tokens.
+    Cached per secret, so a changed SECRET_KEY gets a fresh key schedule.
+    """
+    return hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return bcrypt.checkpw(
@@ -19,7 +49,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    )
     return hashed.decode("utf-8")
 
 
@@ -36,18 +68,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     to_encode = data.copy()
 
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    if settings.ALGORITHM != "HS256":
+        to_encode.update({"exp": datetime.utcnow() + expires_delta})
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    # HS256 fast path: reuse the cached header and HMAC key schedule
+    to_encode.update({"exp": int(time.time() + expires_delta.total_seconds())})
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+    mac = _jwt_hmac(settings.SECRET_KEY).copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
 
 
 def decode_access_token(token: str) -> Optional[dict]:
@@ -76,19 +109,56 @@ def generate_api_key() -> str:
     Returns:
         API key string with 'sk_' prefix
     """
-    return f"sk_{secrets.token_urlsafe(32)}"
+    return f"{API_KEY_PREFIX}{secrets.token_urlsafe(API_KEY_BYTES)}"
+
+
+def generate_api_keys(count: int) -> List[str]:
+    """
+    Generate several secure random API keys from a single entropy read.
+
+    Args:
+        count: Number of keys to generate
+
+    Returns:
+        List of API key strings in the same format as generate_api_key
+
+    Raises:
+        ValueError: If count is negative
+    """
+    if count < 0:
+        raise ValueError("count must be a non-negative integer")
+
+    entropy = os.urandom(count * API_KEY_BYTES)
+    return [
+        API_KEY_PREFIX + _b64url(entropy[i : i + API_KEY_BYTES]).decode("ascii")
+        for i in range(0, len(entropy), API_KEY_BYTES)
+    ]
+
+
+def is_valid_api_key_format(key: str) -> bool:
+    """
+    Cheaply check that a string has the shape of a generated API key.
+
+    Args:
+        key: Candidate API key
+
+    Returns:
+        True if the key has the expected prefix and length
+    """
+    return len(key) == API_KEY_LENGTH and key.startswith(API_KEY_PREFIX)
 
 
 def get_key_hash(key: str) -> str:
     """
     Hash an API key using SHA-256.
 
+    API keys are high-entropy random tokens, so a fast unsalted digest is
+    sufficient and keeps the hash deterministic for direct DB lookups.
+
     Args:
         key: The API key to hash
 
     Returns:
         Hex digest of the hashed key
     """
-    import hashlib
-
     return hashlib.sha256(key.encode()).hexdigest()
@@ -5,25 +5,44 @@ Authentication + API Key Service for service-to-service and user authentication.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager, suppress
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, warm_up_pool
 from app.routers import auth, api_keys, protected
+from app.services.api_keys import flush_last_used, flush_last_used_periodically
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan events for the application.
-    Creates database tables on startup (except during testing).
+    Creates database tables, warms up the connection pool and starts the
+    API key last_used_at flusher on startup (except during testing).
     """
     # Startup: Create database tables only if not in test mode
     import os
 
-    if not os.getenv("TESTING"):
-        Base.metadata.create_all(bind=engine)
+    if os.getenv("TESTING"):
+        yield
+        return
+
+    Base.metadata.create_all(bind=engine)
+    warm_up_pool()
+    flusher = asyncio.create_task(flush_last_used_periodically())
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop the background flusher and persist pending updates
+    flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await flusher
+    try:
+        await flush_last_used()
+    except Exception:
+        logger.exception("Failed to flush API key last_used_at updates on shutdown")
 
 
 # Create FastAPI application
@@ -32,6 +51,7 @@ app = FastAPI(
     description="Task 3: Mini Authentication + API Key System for Service-to-Service Access",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson serializes datetime/UUID natively
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -0,0 +1,35 @@
+"""Partial index on active api key hashes
+
+Revision ID: 612e2f561f33
+Revises: 817f987f51f0
+Create Date: 2026-10-15 09:57:07.838613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '612e2f561f33'
+down_revision: Union[str, None] = '817f987f51f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_api_keys_key_hash'), table_name='api_keys')
+    op.create_index(
+        'ix_api_keys_key_hash_active',
+        'api_keys',
+        ['key_hash'],
+        unique=True,
+        postgresql_where=sa.text('is_revoked = false'),
+        sqlite_where=sa.text('is_revoked = 0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_api_keys_key_hash_active', table_name='api_keys')
+    op.create_index(op.f('ix_api_keys_key_hash'), 'api_keys', ['key_hash'], unique=True)
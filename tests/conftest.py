@@ -10,7 +10,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.database import Base, get_db
 from app.models.auth import User, APIKey
-from app.utils.security import get_password_hash, get_key_hash
+from app.routers import auth as auth_router
+from app.services import api_keys as api_key_service
+from app.utils.security import generate_api_key, get_password_hash, get_key_hash
 from datetime import datetime, timedelta
 
 # Set test environment
@@ -29,7 +31,9 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 @pytest.fixture(scope="function")
@@ -49,6 +53,10 @@ def db():
         db.close()
         # Drop all tables after test
         Base.metadata.drop_all(bind=engine)
+        # Forget API keys validated during the test
+        api_key_service.API_KEY_CACHE.clear()
+        api_key_service.API_KEY_CACHE_IDS.clear()
+        api_key_service._LAST_USED_QUEUE.clear()
 
 
 @pytest.fixture(scope="function")
@@ -67,6 +75,10 @@ def client(db):
     # Apply the override before creating client
     app.dependency_overrides[get_db] = override_get_db
 
+    # Start each test with empty rate limit windows
+    auth_router.signup_limiter.requests.clear()
+    auth_router.login_limiter.requests.clear()
+
     # Create test client (without triggering lifespan)
     with TestClient(app, raise_server_exceptions=True) as test_client:
         yield test_client
@@ -97,7 +109,7 @@ def sample_api_key(db, sample_user):
     """
     Create a sample API key for testing.
     """
-    plain_key = "sk_test_key_123456789"
+    plain_key = generate_api_key()
     api_key = APIKey(
         key_hash=get_key_hash(plain_key),
         name="Test Service",
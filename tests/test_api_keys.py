@@ -2,9 +2,15 @@
 Tests for API key management endpoints.
 """
 
+import asyncio
+import time
 import pytest
-from fastapi import status
+import uuid
+from fastapi import HTTPException, status
 from datetime import datetime, timedelta
+from app.models.auth import APIKey
+from app.services import api_keys as api_key_service
+from app.utils.security import get_key_hash
 
 
 class TestCreateAPIKey:
@@ -140,3 +146,163 @@ class TestRevokeAPIKey:
         response = client.delete(f"/keys/{sample_api_key.id}")
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestLastUsedFlush:
+    """Tests for the batched last_used_at writer."""
+
+    def test_failed_flush_requeues_batch(self, sample_api_key):
+        """Test that a failed write keeps queued timestamps for the next flush."""
+
+        def broken_session():
+            raise RuntimeError("database unavailable")
+
+        api_key_service._LAST_USED_QUEUE[sample_api_key.id] = 100.0
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(api_key_service.flush_last_used(broken_session))
+
+        assert api_key_service._LAST_USED_QUEUE == {sample_api_key.id: 100.0}
+
+    def test_requeue_keeps_newer_timestamp(self, sample_api_key):
+        """Test that requeueing does not overwrite a newer queued timestamp."""
+
+        def broken_session():
+            # Simulate a request using the key while the write is in flight
+            api_key_service._LAST_USED_QUEUE[sample_api_key.id] = 200.0
+            raise RuntimeError("database unavailable")
+
+        api_key_service._LAST_USED_QUEUE[sample_api_key.id] = 100.0
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(api_key_service.flush_last_used(broken_session))
+
+        assert api_key_service._LAST_USED_QUEUE[sample_api_key.id] == 200.0
+
+    def test_periodic_flush_survives_errors(self, monkeypatch):
+        """Test that the background task keeps running after a failed flush."""
+        calls = []
+
+        async def flaky_flush():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("unexpected failure")
+
+        monkeypatch.setattr(api_key_service, "flush_last_used", flaky_flush)
+
+        async def run():
+            task = asyncio.create_task(
+                api_key_service.flush_last_used_periodically(interval=0)
+            )
+            while len(calls) < 2 and not task.done():
+                await asyncio.sleep(0)
+            task.cancel()
+
+        asyncio.run(run())
+
+        assert len(calls) >= 2
+
+
+class TestAPIKeyOwnership:
+    """Service-level tests for ownership-scoped revoke and delete."""
+
+    def test_revoke_foreign_key_not_found(self, db, sample_api_key):
+        """Test that another user cannot revoke the key."""
+        with pytest.raises(HTTPException) as exc_info:
+            api_key_service.revoke_api_key(db, sample_api_key.id, uuid.uuid4())
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        db.refresh(sample_api_key)
+        assert sample_api_key.is_revoked is False
+
+    def test_revoke_own_key(self, db, sample_api_key):
+        """Test that the owner can revoke the key and it leaves the cache."""
+        assert api_key_service.validate_api_key(db, sample_api_key.key) is not None
+        assert get_key_hash(sample_api_key.key) in api_key_service.API_KEY_CACHE
+
+        revoked = api_key_service.revoke_api_key(
+            db, sample_api_key.id, sample_api_key.user_id
+        )
+
+        assert revoked.is_revoked is True
+        db.refresh(sample_api_key)
+        assert sample_api_key.is_revoked is True
+        assert get_key_hash(sample_api_key.key) not in api_key_service.API_KEY_CACHE
+        assert sample_api_key.id not in api_key_service.API_KEY_CACHE_IDS
+
+    def test_delete_foreign_key_not_found(self, db, sample_api_key):
+        """Test that another user cannot delete the key."""
+        with pytest.raises(HTTPException) as exc_info:
+            api_key_service.delete_api_key(db, sample_api_key.id, uuid.uuid4())
+
+        assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+        db.expire_all()
+        assert db.get(APIKey, sample_api_key.id) is not None
+
+    def test_delete_own_key(self, db, sample_api_key):
+        """Test that the owner can delete the key and it leaves the cache."""
+        assert api_key_service.validate_api_key(db, sample_api_key.key) is not None
+
+        api_key_service.delete_api_key(db, sample_api_key.id, sample_api_key.user_id)
+
+        db.expire_all()
+        assert db.get(APIKey, sample_api_key.id) is None
+        assert get_key_hash(sample_api_key.key) not in api_key_service.API_KEY_CACHE
+        assert sample_api_key.id not in api_key_service._LAST_USED_QUEUE
+
+
+class TestAPIKeyCache:
+    """Unit tests for the bounded API key validation cache."""
+
+    @staticmethod
+    def _entry():
+        return {"api_key_id": uuid.uuid4(), "user_id": uuid.uuid4()}
+
+    def test_cache_evicts_least_recently_used(self, db, monkeypatch):
+        """Test that inserting past the size limit drops the oldest entry."""
+        monkeypatch.setattr(api_key_service, "API_KEY_CACHE_MAX_SIZE", 2)
+        first, second, third = self._entry(), self._entry(), self._entry()
+
+        api_key_service._cache_set("a", first)
+        api_key_service._cache_set("b", second)
+        api_key_service._cache_set("c", third)
+
+        assert list(api_key_service.API_KEY_CACHE) == ["b", "c"]
+        assert first["api_key_id"] not in api_key_service.API_KEY_CACHE_IDS
+        assert api_key_service.API_KEY_CACHE_IDS == {
+            second["api_key_id"]: "b",
+            third["api_key_id"]: "c",
+        }
+
+    def test_cache_hit_refreshes_recency(self, db, monkeypatch):
+        """Test that a cache hit moves the entry to the most recent position."""
+        monkeypatch.setattr(api_key_service, "API_KEY_CACHE_MAX_SIZE", 2)
+        first, second, third = self._entry(), self._entry(), self._entry()
+
+        api_key_service._cache_set("a", first)
+        api_key_service._cache_set("b", second)
+        assert api_key_service._cache_get("a") == first
+        api_key_service._cache_set("c", third)
+
+        assert list(api_key_service.API_KEY_CACHE) == ["a", "c"]
+        assert second["api_key_id"] not in api_key_service.API_KEY_CACHE_IDS
+        assert first["api_key_id"] in api_key_service.API_KEY_CACHE_IDS
+
+    def test_expired_entry_leaves_reverse_index(self, db):
+        """Test that an expired entry is dropped from both cache maps."""
+        entry = self._entry()
+        api_key_service._cache_set("a", entry, ttl=-1)
+
+        assert api_key_service._cache_get("a") is None
+        assert "a" not in api_key_service.API_KEY_CACHE
+        assert entry["api_key_id"] not in api_key_service.API_KEY_CACHE_IDS
+
+    def test_cache_entry_expires_with_key(self, db, sample_api_key):
+        """Test that a key expiring soon is not cached past its expiry."""
+        sample_api_key.expires_at = datetime.utcnow() + timedelta(seconds=60)
+        db.commit()
+
+        assert api_key_service.validate_api_key(db, sample_api_key.key) is not None
+
+        _, valid_until = api_key_service.API_KEY_CACHE[get_key_hash(sample_api_key.key)]
+        assert valid_until <= time.monotonic() + 60
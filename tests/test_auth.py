@@ -2,8 +2,15 @@
 Tests for authentication endpoints.
 """
 
+import asyncio
 import pytest
-from fastapi import status
+import uuid
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from app.models.auth import User
+from app.schemas.auth import ForgotPasswordRequest, UserSignup
+from app.services import auth as auth_service
+from app.utils.security import decode_access_token
 
 
 class TestSignup:
@@ -28,6 +35,26 @@ class TestSignup:
         assert "created_at" in data
         assert data["is_active"] is True
 
+    def test_signup_strong_password_success(self, client):
+        """Test that a password meeting the strength rules registers the user."""
+        response = client.post(
+            "/auth/signup",
+            json={
+                "email": "stronguser@example.com",
+                "username": "stronguser",
+                "password": "StrongPass1!",
+            },
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["email"] == "stronguser@example.com"
+        assert data["username"] == "stronguser"
+        assert data["is_active"] is True
+        assert "created_at" in data
+        assert "hashed_password" not in data
+        assert str(uuid.UUID(data["id"])) == data["id"]
+
     def test_signup_duplicate_email(self, client, sample_user):
         """Test signup with duplicate email."""
         response = client.post(
@@ -82,6 +109,19 @@ class TestSignup:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    def test_signup_weak_password(self, client):
+        """Test signup with password missing a special character."""
+        response = client.post(
+            "/auth/signup",
+            json={
+                "email": "newuser@example.com",
+                "username": "newuser",
+                "password": "NoSpecial123",
+            },
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 
 class TestLogin:
     """Tests for user login endpoint."""
@@ -96,6 +136,8 @@ class TestLogin:
         data = response.json()
         assert "access_token" in data
         assert data["token_type"] == "bearer"
+        payload = decode_access_token(data["access_token"])
+        assert payload["sub"] == str(sample_user.id)
 
     def test_login_wrong_password(self, client, sample_user):
         """Test login with incorrect password."""
@@ -126,3 +168,180 @@ class TestLogin:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "inactive" in response.json()["detail"].lower()
+
+
+class TestEmailValidation:
+    """Tests for the email field shared by signup and password reset schemas."""
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "user@example.com",
+            "first.last+tag@mail.example.co",
+            "a1@sub-domain.io",
+            "o'neil@example.org",
+        ],
+    )
+    def test_valid_email_accepted(self, email):
+        """Test that well-formed addresses are accepted unchanged."""
+        assert ForgotPasswordRequest(email=email).email == email
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "not-an-email",
+            "user@example",
+            ".user@example.com",
+            "user.@example.com",
+            "us..er@example.com",
+            "user@-example.com",
+            "user@example-.com",
+            "user@exa_mple.com",
+            "user name@example.com",
+            "us\x00er@example.com",
+            "us\ter@example.com",
+            "us\x7fer@example.com",
+            "a,b(c)@example.com",
+            '"x"y<z>@example.com',
+            "user@1.2",
+            "user@example.c0m",
+        ],
+    )
+    def test_invalid_email_rejected(self, email):
+        """Test that malformed addresses are rejected."""
+        with pytest.raises(ValidationError):
+            ForgotPasswordRequest(email=email)
+
+    def test_email_domain_lowercased(self):
+        """Test that the domain is normalized while the local part is kept."""
+        user = UserSignup(
+            email="Foo@EXAMPLE.com", username="foouser", password="StrongPass1!"
+        )
+
+        assert user.email == "Foo@example.com"
+
+
+class TestPasswordStrength:
+    """Tests for the password strength rule shared by signup and reset schemas."""
+
+    @pytest.mark.parametrize(
+        "password",
+        [
+            "StrongPass1!",
+            "StrongPass\u0661!",  # Arabic-Indic digit one
+            "\u00c9trongpass1!",  # uppercase E with acute accent
+            "STRONGP\u00e4SS1!",  # lowercase a with diaeresis
+        ],
+    )
+    def test_strong_password_accepted(self, password):
+        """Test that non-ASCII letters and digits count toward each class."""
+        user = UserSignup(
+            email="foo@example.com", username="foouser", password=password
+        )
+
+        assert user.password == password
+
+    @pytest.mark.parametrize(
+        "password", ["strongpass1!", "STRONGPASS1!", "StrongPass!!", "StrongPass11"]
+    )
+    def test_weak_password_rejected(self, password):
+        """Test that a password missing any character class is rejected."""
+        with pytest.raises(ValidationError):
+            UserSignup(email="foo@example.com", username="foouser", password=password)
+
+
+class TestCreateUserService:
+    """Service-level tests for create_user conflict handling."""
+
+    def test_email_conflict_reported_before_username(self, db):
+        """Test that an email clash wins when email and username hit different users."""
+        # Insert the username match first so it is the first row scanned
+        db.add_all(
+            [
+                User(
+                    email="first@example.com",
+                    username="takenname",
+                    hashed_password="not-a-real-hash",
+                ),
+                User(
+                    email="taken@example.com",
+                    username="secondname",
+                    hashed_password="not-a-real-hash",
+                ),
+            ]
+        )
+        db.commit()
+
+        user_data = UserSignup(
+            email="taken@example.com", username="takenname", password="StrongPass1!"
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth_service.create_user(db, user_data))
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert exc_info.value.detail == "Email already registered"
+
+    def test_concurrent_signup_integrity_error(self, db, monkeypatch):
+        """Test that a unique-index violation after the check becomes a 400."""
+
+        async def racing_hash(func, *args):
+            # Another request registers the same email while we hash
+            db.add(
+                User(
+                    email="race@example.com",
+                    username="winner",
+                    hashed_password="not-a-real-hash",
+                )
+            )
+            db.commit()
+            return "hashed"
+
+        monkeypatch.setattr(auth_service, "run_in_threadpool", racing_hash)
+        user_data = UserSignup(
+            email="race@example.com", username="loser", password="StrongPass1!"
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth_service.create_user(db, user_data))
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert "already registered" in exc_info.value.detail
+        assert db.query(User).filter(User.username == "loser").first() is None
+
+
+class TestAuthenticateUserService:
+    """Service-level tests for authenticate_user."""
+
+    def test_authenticate_success(self, db, sample_user):
+        """Test that valid credentials return a row usable for token creation."""
+        row = asyncio.run(auth_service.authenticate_user(db, "testuser", "testpass123"))
+
+        assert row.id == sample_user.id
+        assert row.is_active is True
+        payload = decode_access_token(auth_service.create_user_token(row))
+        assert payload["sub"] == str(sample_user.id)
+
+    def test_authenticate_wrong_password(self, db, sample_user):
+        """Test that a wrong password raises 401."""
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth_service.authenticate_user(db, "testuser", "wrongpass"))
+
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_authenticate_unknown_user(self, db):
+        """Test that an unknown username raises 401."""
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth_service.authenticate_user(db, "nobody", "testpass123"))
+
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_authenticate_inactive_user(self, db, sample_user):
+        """Test that an inactive account raises 400 after the password check."""
+        sample_user.is_active = False
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(auth_service.authenticate_user(db, "testuser", "testpass123"))
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
@@ -4,6 +4,9 @@ Tests for protected routes with different authentication types.
 
 import pytest
 from fastapi import status
+import asyncio
+from app.services.api_keys import flush_last_used, revoke_api_key
+from tests.conftest import TestingSessionLocal
 
 
 class TestProtectedUserOnly:
@@ -55,6 +58,36 @@ class TestProtectedServiceOnly:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_access_with_malformed_api_key(self, client):
+        """Test that keys not matching the generated format are rejected."""
+        response = client.get("/protected/service", headers={"x-api-key": "sk_short"})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_access_with_revoked_cached_api_key(self, client, db, sample_api_key):
+        """Test that revoking an API key evicts it from the validation cache."""
+        headers = {"x-api-key": sample_api_key.key}
+        response = client.get("/protected/service", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        revoke_api_key(db, sample_api_key.id, sample_api_key.user_id)
+
+        response = client.get("/protected/service", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_access_records_last_used(self, client, db, sample_api_key):
+        """Test that API key usage is queued and flushed to the database."""
+        response = client.get(
+            "/protected/service", headers={"x-api-key": sample_api_key.key}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert sample_api_key.last_used_at is None
+
+        asyncio.run(flush_last_used(TestingSessionLocal))
+
+        db.refresh(sample_api_key)
+        assert sample_api_key.last_used_at is not None
+
     def test_access_with_jwt(self, client, auth_token):
         """Test that JWT cannot access API-key-only route."""
         response = client.get(
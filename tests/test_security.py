@@ -0,0 +1,111 @@
+"""
+Tests for security utilities.
+"""
+
+import base64
+import json
+import pytest
+from datetime import timedelta
+from app.config import settings
+from app.utils.security import (
+    API_KEY_LENGTH,
+    API_KEY_PREFIX,
+    create_access_token,
+    decode_access_token,
+    generate_api_key,
+    generate_api_keys,
+    is_valid_api_key_format,
+)
+
+
+def _segment(token: str, index: int) -> dict:
+    """Decode one base64url JSON segment of a JWT."""
+    part = token.split(".")[index]
+    return json.loads(base64.urlsafe_b64decode(part + "=" * (-len(part) % 4)))
+
+
+class TestAccessToken:
+    """Tests for JWT access token creation and decoding."""
+
+    def test_token_round_trip(self):
+        """Test that a created token decodes back to its claims."""
+        token = create_access_token({"sub": "user-123"})
+
+        payload = decode_access_token(token)
+        assert payload is not None
+        assert payload["sub"] == "user-123"
+        assert isinstance(payload["exp"], int)
+
+    def test_token_header(self):
+        """Test that tokens carry the standard HS256 header."""
+        token = create_access_token({"sub": "user-123"})
+
+        assert _segment(token, 0) == {"alg": "HS256", "typ": "JWT"}
+
+    def test_expired_token_rejected(self):
+        """Test that a token past its expiry does not decode."""
+        token = create_access_token(
+            {"sub": "user-123"}, expires_delta=timedelta(seconds=-10)
+        )
+
+        assert decode_access_token(token) is None
+
+    def test_token_signed_with_other_key_rejected(self, monkeypatch):
+        """Test that a token signed with a different secret does not decode."""
+        monkeypatch.setattr(settings, "SECRET_KEY", "another-secret-key-" * 3)
+        token = create_access_token({"sub": "user-123"})
+        monkeypatch.undo()
+
+        assert decode_access_token(token) is None
+
+    def test_tampered_token_rejected(self):
+        """Test that changing the payload invalidates the signature."""
+        header, _, signature = create_access_token({"sub": "user-123"}).split(".")
+        forged = base64.urlsafe_b64encode(b'{"sub":"admin","exp":9999999999}')
+        token = f"{header}.{forged.rstrip(b'=').decode()}.{signature}"
+
+        assert decode_access_token(token) is None
+
+
+class TestAPIKeyFormat:
+    """Tests for the API key format check."""
+
+    def test_generated_key_matches_format(self):
+        """Test that a generated key has the prefix and derived length."""
+        key = generate_api_key()
+
+        assert key.startswith(API_KEY_PREFIX)
+        assert len(key) == API_KEY_LENGTH
+        assert is_valid_api_key_format(key)
+
+    def test_malformed_key_fails_format_check(self):
+        """Test that keys with the wrong prefix or length are rejected."""
+        key = generate_api_key()
+
+        assert not is_valid_api_key_format(key[:-1])
+        assert not is_valid_api_key_format(key + "x")
+        assert not is_valid_api_key_format("pk_" + key[3:])
+
+
+class TestAPIKeyGeneration:
+    """Tests for batch API key generation."""
+
+    def test_generate_api_keys_batch(self):
+        """Test that batch generation returns distinct, well-formed keys."""
+        keys = generate_api_keys(5)
+
+        assert len(keys) == 5
+        assert len(set(keys)) == 5
+        for key in keys:
+            assert key.startswith(API_KEY_PREFIX)
+            assert len(key) == API_KEY_LENGTH
+            assert is_valid_api_key_format(key)
+
+    def test_generate_api_keys_empty(self):
+        """Test that requesting zero keys returns an empty list."""
+        assert generate_api_keys(0) == []
+
+    def test_generate_api_keys_negative_count(self):
+        """Test that a negative count raises a clear error."""
+        with pytest.raises(ValueError, match="non-negative"):
+            generate_api_keys(-1)